@@ -1,12 +1,14 @@
 import os
 import json
+import shutil
+import tempfile
 from datetime import datetime, timedelta
 
 KEY_FILE = "Keys"
 DATA_FILE = "key_data.json"
 
 # Load key data (expiration times)
-if os.path.exists(DATA_FILE):
+if os.path.exists(DATA_FILE) and os.path.getsize(DATA_FILE) > 0:
     with open(DATA_FILE, "r") as f:
         key_data = json.load(f)
 else:
@@ -14,23 +16,47 @@ else:
 
 # Remove expired keys
 now = datetime.now().timestamp()
-for key, exp_time in list(key_data.items()):
-    if exp_time < now:
-        print(f"🗑️ Removing expired key: {key}")
-        key_data.pop(key)
+to_remove = [key for key, exp_time in key_data.items() if exp_time < now]
+for key in to_remove:
+    print(f"🗑️ Removing expired key: {key}")
+    key_data.pop(key)
 
-# Save updated key data
-with open(DATA_FILE, "w") as f:
-    json.dump(key_data, f, indent=4)
+# Save updated key data (skip the rewrite when nothing expired, but still
+# create the file on first run)
+if to_remove or not os.path.exists(DATA_FILE):
+    with open(DATA_FILE, "w") as f:
+        json.dump(key_data, f, indent=4)
 
 # Keep only valid keys in Keys file
 if os.path.exists(KEY_FILE):
-    with open(KEY_FILE, "r") as f:
-        lines = [line.strip() for line in f.readlines()]
-
-    valid_keys = [k for k in lines if k in key_data]
-    with open(KEY_FILE, "w") as f:
-        f.write("\n".join(valid_keys) + "\n")
+    # Stream into a temp file next to KEY_FILE, then swap it in atomically
+    key_dir = os.path.dirname(os.path.abspath(KEY_FILE))
+    out = tempfile.NamedTemporaryFile("w", dir=key_dir, delete=False)
+    try:
+        with open(KEY_FILE, "r") as f, out:
+            keys_changed = False
+            wrote_any = False
+            for line in f:
+                stripped = line.strip()
+                if stripped in key_data:
+                    out.write(stripped + "\n")
+                    wrote_any = True
+                    keys_changed = keys_changed or line != stripped + "\n"
+                else:
+                    keys_changed = True
+            if not wrote_any:
+                # Match the old "\n".join(valid_keys) + "\n" output
+                out.write("\n")
+        if keys_changed:
+            # NamedTemporaryFile is created 0600; keep Keys' original mode
+            shutil.copymode(KEY_FILE, out.name)
+            os.replace(out.name, KEY_FILE)
+        else:
+            os.remove(out.name)
+    except BaseException:
+        if os.path.exists(out.name):
+            os.remove(out.name)
+        raise
 
 print("✅ Cleanup complete.")
 